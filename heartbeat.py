@@ -1,11 +1,15 @@
+import asyncio
 import os
 import re
+import signal
+import socket
+import ssl
 import sys
 import time
-from datetime import datetime
 from typing import Optional
 
-import requests
+import httpx
+import orjson
 from getpass import getpass
 
 
@@ -15,6 +19,8 @@ DISCORD_UA = (
     "Chrome/134.0.6998.205 Electron/35.3.0 Safari/537.36"
 )
 
+_QUEST_RE = re.compile(r"/quests/([^/?#]+)")
+
 
 def extract_quest_id(value: str) -> str:
     """Return quest ID from a plain ID or a Discord quest URL/path.
@@ -25,9 +31,12 @@ def extract_quest_id(value: str) -> str:
       - a path-like value containing slashes and ending with the ID
     """
     value = value.strip()
+    # Common case: the user pasted a raw snowflake ID.
+    if value.isdigit():
+        return value
     if "/" in value:
         # Try to find .../quests/<id>(/|\b)
-        m = re.search(r"/quests/([^/?#]+)", value)
+        m = _QUEST_RE.search(value)
         if m:
             return m.group(1)
         # Fallback: take the last non-empty segment
@@ -49,31 +58,28 @@ def build_headers(authorization: str, x_super_properties: str) -> dict:
     }
 
 
-def send_heartbeat_once(session: requests.Session, url: str, body: dict) -> tuple[int, Optional[dict], Optional[str]]:
+async def send_heartbeat_once(client: httpx.AsyncClient, request: httpx.Request) -> tuple[int, Optional[dict], Optional[str]]:
     """Send a single heartbeat. Returns (status, json_or_none, text_or_none)."""
     try:
-        resp = session.post(url, json=body, timeout=20)
-    except requests.RequestException as e:
+        resp = await client.send(request)
+    except httpx.RequestError as e:
         return 0, None, f"Request error: {e}"
 
     status = resp.status_code
     # Some endpoints may respond 204 No Content; handle gracefully
-    content_type = resp.headers.get("content-type", "")
     if status == 204 or not resp.content:
         return status, None, None
 
-    if "application/json" in content_type.lower():
-        try:
-            return status, resp.json(), None
-        except ValueError:
-            # Not valid JSON though claimed; fall back to text
-            return status, None, resp.text
-    else:
+    # The endpoint only ever returns 204 or JSON, so try the parse directly
+    # instead of sniffing the content-type header first.
+    try:
+        return status, orjson.loads(resp.content), None
+    except orjson.JSONDecodeError:
         return status, None, resp.text
 
 
 def now() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return time.strftime("%Y-%m-%d %H:%M:%S")
 
 
 def prompt_value(label: str, env_key: str, *, required: bool = True, secret: bool = False) -> str:
@@ -95,7 +101,7 @@ def prompt_value(label: str, env_key: str, *, required: bool = True, secret: boo
         if value:
             return value
         if env_default:
-            return env_default.strip()
+            return env_default
         if not required:
             return ""
         print("This value is required. Please enter a value.")
@@ -104,7 +110,7 @@ def prompt_value(label: str, env_key: str, *, required: bool = True, secret: boo
 def gather_inputs() -> tuple[str, str, str, str, str]:
     print("Enter the details for your Discord quest heartbeat. Environment variables (DQ_*) will be used as defaults when available.\n")
 
-    quest = prompt_value("Quest ID or URL", "DQ_QUEST_ID")
+    quest = prompt_value("Quest ID(s) or URL(s), comma-separated", "DQ_QUEST_ID")
     voice_channel_id = prompt_value("Voice Channel ID", "DQ_VOICE_CHANNEL_ID")
     user_id = prompt_value("User ID", "DQ_USER_ID")
     authorization = prompt_value("Authorization header", "DQ_AUTHORIZATION", secret=True)
@@ -115,91 +121,153 @@ def gather_inputs() -> tuple[str, str, str, str, str]:
 
 DEFAULT_ENV_FILE = ".env"
 
+# KEY=value with an optional matched pair of quotes around the value.
+_ENV_LINE = re.compile(
+    r'^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|(.*?))\s*$'
+)
+
 
 def load_env_file(path: str = DEFAULT_ENV_FILE) -> None:
     abs_path = os.path.abspath(path)
     if not os.path.isfile(abs_path):
         return
     with open(abs_path, "r", encoding="utf-8") as handle:
-        for raw_line in handle:
-            line = raw_line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            val = value.strip().strip('"').strip("'")
-            if key and key not in os.environ:
-                os.environ[key] = val
-
-
-def main() -> int:
-    load_env_file()
-    quest, voice_channel_id, user_id, authorization, x_super_properties = gather_inputs()
-
-    # Fixed interval per user's request
-    interval = 30.0
-
-    quest_id = extract_quest_id(quest)
+        text = handle.read()
+    for line in text.splitlines():
+        if not line or line[0] == "#":
+            continue
+        m = _ENV_LINE.match(line)
+        if not m:
+            continue
+        key = m.group(1)
+        # First non-None group: double-quoted, single-quoted, or bare value.
+        val = next((g for g in m.groups()[1:] if g is not None), "")
+        if key not in os.environ:
+            os.environ[key] = val
+
+
+async def heartbeat_loop(client: httpx.AsyncClient, quest_id: str, body_bytes: bytes, interval: float, stop: asyncio.Event) -> None:
+    """Run the heartbeat loop for one quest until it completes or `stop` is set."""
     url = f"https://discord.com/api/v9/quests/{quest_id}/heartbeat"
-
-    headers = build_headers(authorization.strip(), x_super_properties.strip())
-    body = {
-        "stream_key": f"call:{voice_channel_id.strip()}:{user_id.strip()}",
-        "terminal": False,
-    }
-
-    session = requests.Session()
-    session.headers.update(headers)
-
-    # Flag to indicate the loop should stop (set when completed_at is non-null)
-    should_stop = False
-
-    def do_send():
-        nonlocal should_stop
-        status, j, t = send_heartbeat_once(session, url, body)
+    # Neither the URL, headers, nor body change between ticks, so build the
+    # request object once and resend it instead of reconstructing it per post.
+    # content-type: application/json is already in the client headers and the
+    # pre-encoded bytes skip a JSON encode per tick.
+    request = client.build_request("POST", url, content=body_bytes)
+    # Schedule against a monotonic deadline so request latency doesn't
+    # accumulate drift: each tick stays on the fixed `interval` grid.
+    next_tick = time.monotonic()
+    while True:
+        status, j, t = await send_heartbeat_once(client, request)
+        # One timestamp per tick; all log lines for this send share it.
+        ts = now()
         if status == 0:
-            print(f"[{now()}] Heartbeat error: {t}")
-            return False
-        if 200 <= status < 300:
-            print(f"[{now()}] Heartbeat OK (status {status}).")
+            print(f"[{ts}] [{quest_id}] Heartbeat error: {t}")
+        elif 200 <= status < 300:
+            print(f"[{ts}] [{quest_id}] Heartbeat OK (status {status}).")
         else:
-            print(f"[{now()}] Heartbeat failed (status {status}).")
+            print(f"[{ts}] [{quest_id}] Heartbeat failed (status {status}).")
         # Print the full response (JSON or text)
         if j is not None:
             try:
-                import json as _json
-                pretty = _json.dumps(j, indent=2, ensure_ascii=False)
+                pretty = orjson.dumps(j, option=orjson.OPT_INDENT_2).decode()
             except Exception:
                 pretty = str(j)
-            print(f"[{now()}] Response JSON:\n{pretty}")
+            print(f"[{ts}] [{quest_id}] Response JSON:\n{pretty}")
 
-            # Stop the loop if the response indicates completion.
+            # Stop this quest's loop if the response indicates completion.
             completed = None
             if isinstance(j, dict):
                 completed = j.get("completed_at")
                 if completed is None and isinstance(j.get("data"), dict):
                     completed = j["data"].get("completed_at")
             if completed is not None:
-                print(f"[{now()}] Detected completed_at = {completed!s}. Stopping heartbeat loop.")
-                should_stop = True
+                print(f"[{ts}] [{quest_id}] Detected completed_at = {completed!s}. Stopping heartbeat loop.")
+                return
         elif t:
-            print(f"[{now()}] Response text:\n{t}")
-        return 200 <= status < 300
+            print(f"[{ts}] [{quest_id}] Response text:\n{t}")
 
-    print(f"Starting heartbeat loop for quest {quest_id} every {interval} seconds. Press Ctrl+C to stop.")
+        next_tick += interval
+        sleep_for = next_tick - time.monotonic()
+        if sleep_for > 0:
+            # Wait on the stop event instead of a plain sleep so shutdown
+            # interrupts the wait immediately rather than after up to 30 s.
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
+        if stop.is_set():
+            return
+
+
+async def run_heartbeats(quest_ids: list[str], headers: dict, body_bytes: bytes, interval: float) -> None:
+    """Drive all quest loops concurrently on one connection pool.
+
+    A single HTTP/2-capable client shares TCP+TLS state across quests, so
+    adding quests doesn't add handshakes or processes.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            # Windows event loops don't support signal handlers; Ctrl+C falls
+            # back to the KeyboardInterrupt handling in main().
+            pass
+
+    limits = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+    # One SSLContext for the lifetime of the run: its TLS session cache lets
+    # a reconnect after an idle drop resume the old session (1 RTT) instead
+    # of running a full handshake.
+    ssl_context = ssl.create_default_context()
+    ssl_context.set_alpn_protocols(["h2", "http/1.1"])
+    # TCP_NODELAY avoids Nagle/delayed-ACK stalls on our sub-MSS payloads;
+    # SO_KEEPALIVE lets the OS notice a dead idle connection before the next
+    # tick instead of hanging the post.
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=limits,
+        verify=ssl_context,
+        socket_options=[
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ],
+    )
+    async with httpx.AsyncClient(transport=transport, headers=headers, timeout=20.0) as client:
+        tasks = [
+            asyncio.create_task(heartbeat_loop(client, quest_id, body_bytes, interval, stop))
+            for quest_id in quest_ids
+        ]
+        await asyncio.gather(*tasks)
+    if stop.is_set():
+        print("\nStopped.")
+
+
+def main() -> int:
+    load_env_file()
+    quest, voice_channel_id, user_id, authorization, x_super_properties = gather_inputs()
+
+    # Fixed interval per user's request
+    interval = 30.0
+
+    quest_ids = [extract_quest_id(q) for q in quest.split(",") if q.strip()]
+
+    # prompt_value already returns stripped strings; no need to re-strip here.
+    headers = build_headers(authorization, x_super_properties)
+    # The body never changes between ticks, so serialize it exactly once.
+    body_bytes = orjson.dumps({
+        "stream_key": f"call:{voice_channel_id}:{user_id}",
+        "terminal": False,
+    })
+
+    print(f"Starting heartbeat loop for quest(s) {', '.join(quest_ids)} every {interval} seconds. Press Ctrl+C to stop.")
     try:
-        while True:
-            do_send()
-            if should_stop:
-                break
-            time.sleep(interval)
+        asyncio.run(run_heartbeats(quest_ids, headers, body_bytes, interval))
     except KeyboardInterrupt:
         print("\nStopped.")
-        return 0
     return 0
 
 
 if __name__ == "__main__":
     sys.exit(main())
-if __name__ == "__main__":
-    sys.exit(main())